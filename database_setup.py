@@ -6,21 +6,69 @@ Inserts test data for demonstrations
 
 import sqlite3
 from datetime import datetime
-import os
+from itertools import chain, islice
+
+# Conservative bound-parameter limit per statement (SQLite's historical default);
+# the single batch-size setting for every bulk write path
+MAX_BOUND_VARIABLES = 999
+
+def rows_per_batch(params_per_row):
+    """
+    Number of rows per batch so one batch binds at most MAX_BOUND_VARIABLES
+    """
+    return max(1, MAX_BOUND_VARIABLES // params_per_row)
+
+def _chunked(rows, size):
+    """
+    Yield successive lists of at most `size` rows from an iterable
+    """
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _insert_rows(cursor, table, columns, rows):
+    """
+    Insert rows using multi-row VALUES statements, as many rows per
+    statement as the bound-parameter limit allows
+    """
+    placeholder = "(" + ", ".join(["?"] * len(columns)) + ")"
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    for chunk in _chunked(rows, rows_per_batch(len(columns))):
+        cursor.execute(
+            prefix + ", ".join([placeholder] * len(chunk)),
+            list(chain.from_iterable(chunk))
+        )
 
 def create_database(db_path="customer_service.db"):
     """
     Create database with customers and tickets tables
-    """
-    # Remove existing database if present
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        print(f"✓ Removed existing database: {db_path}")
 
+    Tables are reset in place, so this also works while an MCPServer has the
+    file open; call its clear_cache() afterwards to drop cached customers.
+    """
     # Create connection
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    # Relax durability while seeding; restored once the data is committed.
+    # A WAL database (set by MCPServer) is left in WAL: switching journal
+    # mode needs exclusive access and fails while a server is connected.
+    journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    if journal_mode != "wal":
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+
+    # Rebuild schema and seed data inside a single explicit transaction
+    cursor.execute("BEGIN")
+
+    # Drop existing tables in place (tickets first, it references customers)
+    cursor.execute("DROP TABLE IF EXISTS tickets")
+    cursor.execute("DROP TABLE IF EXISTS customers")
+    print("✓ Dropped existing tables")
+
     # Create customers table
     cursor.execute("""
         CREATE TABLE customers (
@@ -30,7 +78,9 @@ def create_database(db_path="customer_service.db"):
             phone TEXT,
             status TEXT DEFAULT 'active' CHECK(status IN ('active', 'disabled')),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            open_ticket_count INTEGER NOT NULL DEFAULT 0,
+            high_priority_count INTEGER NOT NULL DEFAULT 0
         )
     """)
     print("✓ Created customers table")
@@ -63,10 +113,7 @@ def create_database(db_path="customer_service.db"):
         ("Jack Taylor", "jack.taylor@small.biz", "+1-555-1010", "active")
     ]
 
-    cursor.executemany(
-        "INSERT INTO customers (name, email, phone, status) VALUES (?, ?, ?, ?)",
-        test_customers
-    )
+    _insert_rows(cursor, "customers", ("name", "email", "phone", "status"), test_customers)
     print(f"✓ Inserted {len(test_customers)} test customers")
 
     # Insert test tickets
@@ -106,14 +153,68 @@ def create_database(db_path="customer_service.db"):
         (10, "Product inquiry", "resolved", "low")
     ]
 
-    cursor.executemany(
-        "INSERT INTO tickets (customer_id, issue, status, priority) VALUES (?, ?, ?, ?)",
-        test_tickets
-    )
+    _insert_rows(cursor, "tickets", ("customer_id", "issue", "status", "priority"), test_tickets)
     print(f"✓ Inserted {len(test_tickets)} test tickets")
 
-    # Commit and close
+    # Create indexes after the bulk load, then refresh planner statistics
+    cursor.execute("CREATE INDEX idx_tickets_customer ON tickets(customer_id, created_at DESC)")
+    cursor.execute("CREATE INDEX idx_tickets_status_priority ON tickets(status, priority)")
+    cursor.execute("CREATE INDEX idx_customers_status ON customers(status, id)")
+    cursor.execute("ANALYZE")
+    print("✓ Created indexes")
+
+    # Populate the per-customer ticket counters once, then keep them in
+    # sync with triggers on every ticket write (same transaction as the
+    # schema, so the counters never exist without their triggers)
+    cursor.execute("""
+        UPDATE customers SET
+            open_ticket_count = (
+                SELECT COUNT(*) FROM tickets
+                WHERE tickets.customer_id = customers.id AND tickets.status = 'open'
+            ),
+            high_priority_count = (
+                SELECT COUNT(*) FROM tickets
+                WHERE tickets.customer_id = customers.id AND tickets.priority = 'high'
+            )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_tickets_insert AFTER INSERT ON tickets
+        BEGIN
+            UPDATE customers SET
+                open_ticket_count = open_ticket_count + (NEW.status IS 'open'),
+                high_priority_count = high_priority_count + (NEW.priority IS 'high')
+            WHERE id = NEW.customer_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_tickets_delete AFTER DELETE ON tickets
+        BEGIN
+            UPDATE customers SET
+                open_ticket_count = open_ticket_count - (OLD.status IS 'open'),
+                high_priority_count = high_priority_count - (OLD.priority IS 'high')
+            WHERE id = OLD.customer_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER trg_tickets_update AFTER UPDATE OF customer_id, status, priority ON tickets
+        BEGIN
+            UPDATE customers SET
+                open_ticket_count = open_ticket_count - (OLD.status IS 'open'),
+                high_priority_count = high_priority_count - (OLD.priority IS 'high')
+            WHERE id = OLD.customer_id;
+            UPDATE customers SET
+                open_ticket_count = open_ticket_count + (NEW.status IS 'open'),
+                high_priority_count = high_priority_count + (NEW.priority IS 'high')
+            WHERE id = NEW.customer_id;
+        END
+    """)
     conn.commit()
+    print("✓ Created ticket counter triggers")
+
+    # Restore default durability settings and close
+    cursor.execute("PRAGMA synchronous=FULL")
+    if journal_mode != "wal":
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
     conn.close()
 
     print(f"\n✓ Database created successfully: {db_path}")
@@ -161,6 +262,9 @@ def print_database_stats(db_path="customer_service.db"):
 def reset_database(db_path="customer_service.db"):
     """
     Reset database to initial state
+
+    A running MCPServer keeps serving from the same file; call its
+    clear_cache() so it does not return pre-reset customers.
     """
     print("\n🔄 Resetting database...")
     return create_database(db_path)
@@ -10,9 +10,151 @@ Implements 5 required tools:
 """
 
 import sqlite3
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from itertools import chain
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 import json
+import logging
+import sys
+
+from database_setup import rows_per_batch
+
+logger = logging.getLogger(__name__)
+
+# Number of pooled read connections kept open by the server
+DEFAULT_POOL_SIZE = 4
+
+# Seconds to wait for a free pooled connection before giving up
+POOL_TIMEOUT = 10.0
+
+# Per-connection PRAGMAs applied to every handle opened by the server
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Lightweight row types for read-heavy paths (cheaper than sqlite3.Row + dict)
+CustomerRow = namedtuple(
+    "CustomerRow", "id name email phone status created_at updated_at"
+)
+HistoryRow = namedtuple(
+    "HistoryRow",
+    CustomerRow._fields + (
+        "open_ticket_count", "high_priority_count",
+        "ticket_id", "issue", "ticket_status", "priority", "ticket_created_at"
+    )
+)
+
+def _customer_row(cursor, row):
+    """Row factory producing CustomerRow tuples"""
+    return CustomerRow(*row)
+
+def _history_row(cursor, row):
+    """Row factory producing HistoryRow tuples"""
+    return HistoryRow(*row)
+
+# Valid values for writable columns
+ALLOWED_CUSTOMER_FIELDS = ('name', 'email', 'phone', 'status')
+VALID_PRIORITIES = frozenset(('low', 'medium', 'high'))
+
+# get_customer result cache: entry lifetime in seconds and maximum entries
+CUSTOMER_CACHE_TTL = 30.0
+CUSTOMER_CACHE_SIZE = 1024
+
+# Schema objects the server depends on; databases created before the
+# trigger-maintained ticket counters lack the last two groups
+_REQUIRED_TABLES = ('customers', 'tickets')
+_REQUIRED_TRIGGERS = ('trg_tickets_insert', 'trg_tickets_delete', 'trg_tickets_update')
+_REQUIRED_CUSTOMER_COLUMNS = ('open_ticket_count', 'high_priority_count')
+
+# Size of each connection's prepared-statement cache
+CACHED_STATEMENTS = 256
+
+# SQL used by the tools, kept constant so each connection's statement cache hits
+_SQL_GET_CUSTOMER = """
+    SELECT id, name, email, phone, status, created_at, updated_at
+    FROM customers
+    WHERE id = ?
+"""
+
+_SQL_LIST_CUSTOMERS = """
+    SELECT id, name, email, phone, status, created_at, updated_at
+    FROM customers
+    WHERE (:status IS NULL OR status = :status)
+    ORDER BY id
+    LIMIT :limit
+"""
+
+_SQL_INSERT_TICKET = """
+    INSERT INTO tickets (customer_id, issue, status, priority)
+    VALUES (?, ?, 'open', ?)
+"""
+
+# Multi-row ticket insert: prefix followed by one VALUES group per row
+_SQL_INSERT_TICKETS_PREFIX = "INSERT INTO tickets (customer_id, issue, status, priority) VALUES "
+_SQL_TICKET_VALUES_ROW = "(?, ?, 'open', ?)"
+_TICKET_ROWS_PER_STATEMENT = rows_per_batch(3)
+
+_SQL_CUSTOMER_HISTORY = """
+    SELECT c.id, c.name, c.email, c.phone, c.status, c.created_at, c.updated_at,
+           c.open_ticket_count, c.high_priority_count,
+           t.id AS ticket_id, t.issue, t.status AS ticket_status,
+           t.priority, t.created_at AS ticket_created_at
+    FROM customers c
+    LEFT JOIN tickets t ON t.customer_id = c.id
+    WHERE c.id = ?
+    ORDER BY t.created_at DESC
+"""
+
+_SQL_CUSTOMER_STATS = """
+    SELECT COALESCE(SUM(status = 'active'), 0),
+           COALESCE(SUM(status = 'disabled'), 0)
+    FROM customers
+"""
+
+_SQL_TICKET_STATS = """
+    SELECT COALESCE(SUM(status = 'open'), 0),
+           COALESCE(SUM(status = 'in_progress'), 0),
+           COALESCE(SUM(priority = 'high'), 0)
+    FROM tickets
+"""
+
+# get_tickets_by_criteria: customer_ids lists are padded with NULL up to one
+# of these sizes so only a bounded set of SQL strings is ever prepared
+_TICKET_ID_BUCKETS = (0, 1, 2, 4, 8, 16, 32)
+
+def _build_ticket_query(has_status: bool, has_priority: bool, id_slots: int) -> str:
+    """Build the get_tickets_by_criteria SQL for one filter shape"""
+    query = "SELECT * FROM tickets WHERE 1=1"
+    if has_status:
+        query += " AND status = ?"
+    if has_priority:
+        query += " AND priority = ?"
+    if id_slots:
+        query += f" AND customer_id IN ({','.join(['?'] * id_slots)})"
+    return query + " ORDER BY created_at DESC"
+
+_TICKET_QUERY_CACHE = {
+    (has_status, has_priority, id_slots): _build_ticket_query(has_status, has_priority, id_slots)
+    for has_status in (False, True)
+    for has_priority in (False, True)
+    for id_slots in _TICKET_ID_BUCKETS
+}
+
+def _ticket_id_slots(count: int) -> int:
+    """Round a customer_ids count up to its bucket (next power of two past 32)"""
+    for bucket in _TICKET_ID_BUCKETS:
+        if count <= bucket:
+            return bucket
+    return 1 << (count - 1).bit_length()
 
 class MCPServer:
     """
@@ -20,43 +162,168 @@ class MCPServer:
     Provides standardized tools for customer and ticket management
     """
 
-    def __init__(self, db_path: str = "customer_service.db"):
+    def __init__(self, db_path: str = "customer_service.db", pool_size: int = DEFAULT_POOL_SIZE):
         """
         Initialize MCP server with database connection
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of pooled read connections (at least 1)
         """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
         self.db_path = db_path
         self._validate_database()
-        print(f"✓ MCP Server initialized with database: {db_path}")
+        self._enable_wal()
+
+        # Read connections are shared through a pool; writes are serialized
+        # on a single dedicated connection
+        self._pool = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._get_connection())
+        self._write_conn = self._get_connection()
+        self._write_lock = threading.Lock()
+
+        # LRU cache of customer_id -> (expiry time, customer dict)
+        self._cust_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cust_cache_lock = threading.Lock()
+        # customer_id -> invalidation count, plus a whole-cache epoch bumped
+        # by clear_cache(); lets get_customer detect an update that landed
+        # between its SELECT and the cache store
+        self._cust_cache_gen: Dict[int, int] = {}
+        self._cust_cache_epoch = 0
+        logger.info("✓ MCP Server initialized with database: %s", db_path)
 
     def _validate_database(self):
-        """Validate database exists and has required tables"""
+        """Validate database exists and has required tables, columns and triggers"""
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            # Check for customers table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='customers'")
-            if not cursor.fetchone():
-                raise Exception("customers table not found")
-
-            # Check for tickets table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='tickets'")
-            if not cursor.fetchone():
-                raise Exception("tickets table not found")
-
+            # Check for required tables and triggers in one lookup
+            names = _REQUIRED_TABLES + _REQUIRED_TRIGGERS
+            cursor.execute(
+                "SELECT type, name FROM sqlite_master "
+                f"WHERE type IN ('table', 'trigger') AND name IN ({','.join(['?'] * len(names))})",
+                names
+            )
+            found = set(cursor.fetchall())
+
+            cursor.execute("SELECT name FROM pragma_table_info('customers')")
+            columns = {row[0] for row in cursor.fetchall()}
             conn.close()
+
+            for table in _REQUIRED_TABLES:
+                if ('table', table) not in found:
+                    raise Exception(f"{table} table not found")
+
+            missing = [c for c in _REQUIRED_CUSTOMER_COLUMNS if c not in columns]
+            missing += [t for t in _REQUIRED_TRIGGERS if ('trigger', t) not in found]
+            if missing:
+                raise Exception(
+                    f"schema is out of date (missing {', '.join(missing)}); "
+                    "re-run database_setup.py"
+                )
         except Exception as e:
             raise Exception(f"Database validation failed: {e}")
 
-    def _get_connection(self):
-        """Get database connection"""
+    def _enable_wal(self):
+        """Switch database to WAL journaling (persists across connections)"""
         conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.close()
+
+    def _get_connection(self):
+        """Open a new configured database connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS
+        )
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    @contextmanager
+    def _conn(self):
+        """Borrow a read connection from the pool"""
+        try:
+            conn = self._pool.get(timeout=POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(
+                f"No pooled connection available after {POOL_TIMEOUT}s "
+                "(unclosed iter_* generators hold connections)"
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _writer(self):
+        """Hold the dedicated write connection, rolling back on failure"""
+        with self._write_lock:
+            try:
+                yield self._write_conn
+            except Exception:
+                self._write_conn.rollback()
+                raise
+
+    def _cache_get(self, customer_id: int) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached customer, or None if missing or expired"""
+        with self._cust_cache_lock:
+            entry = self._cust_cache.get(customer_id)
+            if entry is None:
+                return None
+            expires, customer = entry
+            if expires < time.monotonic():
+                del self._cust_cache[customer_id]
+                return None
+            self._cust_cache.move_to_end(customer_id)
+            return dict(customer)
+
+    def _cache_generation(self, customer_id: int) -> Tuple[int, int]:
+        """Current invalidation state for a customer (read before querying)"""
+        with self._cust_cache_lock:
+            return self._cust_cache_epoch, self._cust_cache_gen.get(customer_id, 0)
+
+    def _cache_put(self, customer_id: int, customer: Dict[str, Any], generation: Tuple[int, int]):
+        """
+        Cache a copy of a customer, evicting the least recently used entry.
+        Skipped if the customer was invalidated since `generation` was read.
+        """
+        with self._cust_cache_lock:
+            if (self._cust_cache_epoch, self._cust_cache_gen.get(customer_id, 0)) != generation:
+                return
+            self._cust_cache[customer_id] = (time.monotonic() + CUSTOMER_CACHE_TTL, dict(customer))
+            self._cust_cache.move_to_end(customer_id)
+            if len(self._cust_cache) > CUSTOMER_CACHE_SIZE:
+                self._cust_cache.popitem(last=False)
+
+    def _cache_invalidate(self, *customer_ids: int):
+        """Drop cached customers after they change"""
+        with self._cust_cache_lock:
+            for customer_id in customer_ids:
+                self._cust_cache.pop(customer_id, None)
+                self._cust_cache_gen[customer_id] = self._cust_cache_gen.get(customer_id, 0) + 1
+
+    def clear_cache(self):
+        """Drop every cached customer (e.g. after database_setup.reset_database)"""
+        with self._cust_cache_lock:
+            self._cust_cache.clear()
+            self._cust_cache_epoch += 1
+
+    def close(self):
+        """Close all pooled and write connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._write_conn.close()
+
     def get_customer(self, customer_id: int) -> Optional[Dict[str, Any]]:
         """
         Tool 1: Get customer by ID
@@ -67,31 +334,35 @@ class MCPServer:
         Returns:
             Customer dict or None if not found
         """
-        print(f"\n🔧 MCP Tool: get_customer(customer_id={customer_id})")
+        logger.debug("🔧 MCP Tool: get_customer(customer_id=%s)", customer_id)
+
+        cached = self._cache_get(customer_id)
+        if cached is not None:
+            logger.debug("   ✓ Found (cached): %s (%s)", cached['name'], cached['email'])
+            return cached
+
+        generation = self._cache_generation(customer_id)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = _customer_row
 
-            cursor.execute("""
-                SELECT id, name, email, phone, status, created_at, updated_at
-                FROM customers
-                WHERE id = ?
-            """, (customer_id,))
+                cursor.execute(_SQL_GET_CUSTOMER, (customer_id,))
 
-            row = cursor.fetchone()
-            conn.close()
+                row = cursor.fetchone()
 
             if not row:
-                print(f"   ❌ Customer {customer_id} not found")
+                logger.debug("   ❌ Customer %s not found", customer_id)
                 return None
 
-            customer = dict(row)
-            print(f"   ✓ Found: {customer['name']} ({customer['email']})")
+            customer = row._asdict()
+            self._cache_put(customer_id, customer, generation)
+            logger.debug("   ✓ Found: %s (%s)", customer['name'], customer['email'])
             return customer
 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return None
 
     def list_customers(self, status: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
@@ -105,38 +376,24 @@ class MCPServer:
         Returns:
             List of customer dicts
         """
-        print(f"\n🔧 MCP Tool: list_customers(status={status}, limit={limit})")
+        logger.debug("🔧 MCP Tool: list_customers(status=%s, limit=%s)", status, limit)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = _customer_row
 
-            if status:
-                cursor.execute("""
-                    SELECT id, name, email, phone, status, created_at, updated_at
-                    FROM customers
-                    WHERE status = ?
-                    ORDER BY id
-                    LIMIT ?
-                """, (status, limit))
-            else:
-                cursor.execute("""
-                    SELECT id, name, email, phone, status, created_at, updated_at
-                    FROM customers
-                    ORDER BY id
-                    LIMIT ?
-                """, (limit,))
-
-            rows = cursor.fetchall()
-            conn.close()
+                cursor.execute(_SQL_LIST_CUSTOMERS, {"status": status or None, "limit": limit})
+
+                rows = cursor.fetchall()
 
-            customers = [dict(row) for row in rows]
-            print(f"   ✓ Found {len(customers)} customers")
+            customers = [row._asdict() for row in rows]
+            logger.debug("   ✓ Found %s customers", len(customers))
 
             return customers
 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return []
 
     def update_customer(self, customer_id: int, data: Dict[str, Any]) -> bool:
@@ -150,30 +407,24 @@ class MCPServer:
         Returns:
             True if successful, False otherwise
         """
-        print(f"\n🔧 MCP Tool: update_customer(customer_id={customer_id}, data={data})")
+        logger.debug("🔧 MCP Tool: update_customer(customer_id=%s, data=%s)", customer_id, data)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
             # Build dynamic UPDATE query
-            allowed_fields = ['name', 'email', 'phone', 'status']
             update_fields = []
             values = []
 
             for field, value in data.items():
-                if field in allowed_fields:
+                if field in ALLOWED_CUSTOMER_FIELDS:
                     update_fields.append(f"{field} = ?")
                     values.append(value)
 
             if not update_fields:
-                print("   ⚠️  No valid fields to update")
-                conn.close()
+                logger.debug("   ⚠️  No valid fields to update")
                 return False
 
-            # Add updated_at timestamp
-            update_fields.append("updated_at = ?")
-            values.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            # Add updated_at timestamp (set by the database clock)
+            update_fields.append("updated_at = CURRENT_TIMESTAMP")
 
             # Add customer_id for WHERE clause
             values.append(customer_id)
@@ -184,20 +435,21 @@ class MCPServer:
                 WHERE id = ?
             """
 
-            cursor.execute(query, values)
-            conn.commit()
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, values)
+                conn.commit()
 
             if cursor.rowcount == 0:
-                print(f"   ❌ Customer {customer_id} not found")
-                conn.close()
+                logger.debug("   ❌ Customer %s not found", customer_id)
                 return False
 
-            print(f"   ✓ Updated customer {customer_id}")
-            conn.close()
+            self._cache_invalidate(customer_id)
+            logger.debug("   ✓ Updated customer %s", customer_id)
             return True
 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return False
 
     def create_ticket(self, customer_id: int, issue: str, priority: str = "medium") -> Optional[int]:
@@ -212,40 +464,31 @@ class MCPServer:
         Returns:
             Ticket ID if successful, None otherwise
         """
-        print(f"\n🔧 MCP Tool: create_ticket(customer_id={customer_id}, priority={priority})")
-        print(f"   Issue: {issue[:50]}...")
+        logger.debug("🔧 MCP Tool: create_ticket(customer_id=%s, priority=%s)", customer_id, priority)
+        logger.debug("   Issue: %s...", issue[:50])
 
         try:
             # Validate priority
-            if priority not in ['low', 'medium', 'high']:
-                print(f"   ❌ Invalid priority: {priority}")
+            if priority not in VALID_PRIORITIES:
+                logger.debug("   ❌ Invalid priority: %s", priority)
                 return None
 
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Check if customer exists
-            cursor.execute("SELECT id FROM customers WHERE id = ?", (customer_id,))
-            if not cursor.fetchone():
-                print(f"   ❌ Customer {customer_id} not found")
-                conn.close()
+            # Create ticket; the foreign key rejects unknown customers
+            try:
+                with self._writer() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(_SQL_INSERT_TICKET, (customer_id, issue, priority))
+                    conn.commit()
+                    ticket_id = cursor.lastrowid
+            except sqlite3.IntegrityError:
+                logger.debug("   ❌ Customer %s not found", customer_id)
                 return None
 
-            # Create ticket
-            cursor.execute("""
-                INSERT INTO tickets (customer_id, issue, status, priority)
-                VALUES (?, ?, 'open', ?)
-            """, (customer_id, issue, priority))
-
-            conn.commit()
-            ticket_id = cursor.lastrowid
-
-            print(f"   ✓ Created ticket #{ticket_id}")
-            conn.close()
+            logger.debug("   ✓ Created ticket #%s", ticket_id)
             return ticket_id
 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return None
 
     def get_customer_history(self, customer_id: int) -> Dict[str, Any]:
@@ -258,61 +501,151 @@ class MCPServer:
         Returns:
             Dict with customer info and ticket history
         """
-        print(f"\n🔧 MCP Tool: get_customer_history(customer_id={customer_id})")
+        logger.debug("🔧 MCP Tool: get_customer_history(customer_id=%s)", customer_id)
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = _history_row
 
-            # Get customer info
-            cursor.execute("""
-                SELECT id, name, email, phone, status, created_at, updated_at
-                FROM customers
-                WHERE id = ?
-            """, (customer_id,))
+                # Get customer info, trigger-maintained ticket counts and
+                # tickets in one query
+                cursor.execute(_SQL_CUSTOMER_HISTORY, (customer_id,))
 
-            customer_row = cursor.fetchone()
+                rows = cursor.fetchall()
 
-            if not customer_row:
-                print(f"   ❌ Customer {customer_id} not found")
-                conn.close()
+            if not rows:
+                logger.debug("   ❌ Customer %s not found", customer_id)
                 return None
 
-            customer = dict(customer_row)
-
-            # Get all tickets for this customer
-            cursor.execute("""
-                SELECT id, issue, status, priority, created_at
-                FROM tickets
-                WHERE customer_id = ?
-                ORDER BY created_at DESC
-            """, (customer_id,))
-
-            ticket_rows = cursor.fetchall()
-            tickets = [dict(row) for row in ticket_rows]
+            first = rows[0]
+            customer = CustomerRow._make(first[:len(CustomerRow._fields)])._asdict()
+
+            # LEFT JOIN yields a single NULL ticket row when there are no tickets
+            tickets = [
+                {
+                    "id": row.ticket_id,
+                    "issue": row.issue,
+                    "status": row.ticket_status,
+                    "priority": row.priority,
+                    "created_at": row.ticket_created_at
+                }
+                for row in rows if row.ticket_id is not None
+            ]
 
             # Build history
             history = {
                 "customer": customer,
                 "tickets": tickets,
                 "ticket_count": len(tickets),
-                "open_tickets": len([t for t in tickets if t['status'] == 'open']),
-                "high_priority_tickets": len([t for t in tickets if t['priority'] == 'high'])
+                "open_tickets": first.open_ticket_count,
+                "high_priority_tickets": first.high_priority_count
             }
 
-            print(f"   ✓ Found customer: {customer['name']}")
-            print(f"   ✓ Total tickets: {len(tickets)}")
-            print(f"   ✓ Open tickets: {history['open_tickets']}")
+            logger.debug("   ✓ Found customer: %s", customer['name'])
+            logger.debug("   ✓ Total tickets: %s", len(tickets))
+            logger.debug("   ✓ Open tickets: %s", history['open_tickets'])
 
-            conn.close()
             return history
 
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            logger.error("   ❌ Error: %s", e)
             return None
 
     # Additional helper methods
 
+    def bulk_create_tickets(self, rows: List[Tuple[int, str, str]]) -> int:
+        """
+        Create many support tickets in a single transaction
+
+        Args:
+            rows: List of (customer_id, issue, priority) tuples
+
+        Returns:
+            Number of tickets created (0 if any row is rejected)
+        """
+        logger.debug("🔧 MCP Tool: bulk_create_tickets(rows=%s)", len(rows))
+
+        try:
+            # Validate priorities up front
+            invalid = {priority for _, _, priority in rows} - VALID_PRIORITIES
+            if invalid:
+                logger.debug("   ❌ Invalid priorities: %s", sorted(invalid))
+                return 0
+
+            try:
+                with self._writer() as conn:
+                    cursor = conn.cursor()
+                    # Insert several rows per statement; full chunks reuse
+                    # the same SQL text and hit the statement cache
+                    for start in range(0, len(rows), _TICKET_ROWS_PER_STATEMENT):
+                        chunk = rows[start:start + _TICKET_ROWS_PER_STATEMENT]
+                        cursor.execute(
+                            _SQL_INSERT_TICKETS_PREFIX + ", ".join([_SQL_TICKET_VALUES_ROW] * len(chunk)),
+                            list(chain.from_iterable(chunk))
+                        )
+                    conn.commit()
+            except sqlite3.IntegrityError:
+                logger.debug("   ❌ Unknown customer in batch")
+                return 0
+
+            logger.debug("   ✓ Created %s tickets", len(rows))
+            return len(rows)
+
+        except Exception as e:
+            logger.error("   ❌ Error: %s", e)
+            return 0
+
+    def bulk_update_customers(self, updates: Dict[int, Dict[str, Any]]) -> int:
+        """
+        Update many customers in a single transaction
+
+        Args:
+            updates: Mapping of customer ID to dict of fields to update
+
+        Returns:
+            Number of customers updated
+        """
+        logger.debug("🔧 MCP Tool: bulk_update_customers(customers=%s)", len(updates))
+
+        try:
+            # Group updates by the set of fields they touch so each group
+            # shares one UPDATE statement
+            groups: Dict[Tuple[str, ...], List[Tuple[Any, ...]]] = {}
+            for customer_id, data in updates.items():
+                fields = tuple(f for f in ALLOWED_CUSTOMER_FIELDS if f in data)
+                if fields:
+                    params = tuple(data[f] for f in fields) + (customer_id,)
+                    groups.setdefault(fields, []).append(params)
+
+            if not groups:
+                logger.debug("   ⚠️  No valid fields to update")
+                return 0
+
+            updated = 0
+            with self._writer() as conn:
+                cursor = conn.cursor()
+                for fields, params in groups.items():
+                    assignments = ', '.join(f"{field} = ?" for field in fields)
+                    query = f"""
+                        UPDATE customers
+                        SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    """
+                    batch = rows_per_batch(len(fields) + 1)
+                    for start in range(0, len(params), batch):
+                        cursor.executemany(query, params[start:start + batch])
+                        updated += cursor.rowcount
+                conn.commit()
+
+            self._cache_invalidate(*updates)
+            logger.debug("   ✓ Updated %s customers", updated)
+            return updated
+
+        except Exception as e:
+            logger.error("   ❌ Error: %s", e)
+            return 0
+
     def get_tickets_by_criteria(self, status: Optional[str] = None,
                                  priority: Optional[str] = None,
                                  customer_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
@@ -320,61 +653,100 @@ class MCPServer:
         Get tickets by various criteria (helper for complex queries)
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            query, params = self._ticket_query(status, priority, customer_ids)
 
-            query = "SELECT * FROM tickets WHERE 1=1"
-            params = []
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
 
-            if status:
-                query += " AND status = ?"
-                params.append(status)
+            return [dict(row) for row in rows]
 
-            if priority:
-                query += " AND priority = ?"
-                params.append(priority)
+        except Exception as e:
+            logger.error("Error getting tickets: %s", e)
+            return []
 
-            if customer_ids:
-                placeholders = ','.join(['?'] * len(customer_ids))
-                query += f" AND customer_id IN ({placeholders})"
-                params.extend(customer_ids)
+    def _ticket_query(self, status: Optional[str], priority: Optional[str],
+                      customer_ids: Optional[List[int]]) -> Tuple[str, List[Any]]:
+        """Pick the precompiled ticket query and bind parameters for a filter set"""
+        params = []
 
-            query += " ORDER BY created_at DESC"
+        if status:
+            params.append(status)
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
+        if priority:
+            params.append(priority)
 
-            return [dict(row) for row in rows]
+        id_slots = 0
+        if customer_ids:
+            # Pad with NULL, which never matches in an IN list
+            id_slots = _ticket_id_slots(len(customer_ids))
+            params.extend(customer_ids)
+            params.extend([None] * (id_slots - len(customer_ids)))
 
-        except Exception as e:
-            print(f"Error getting tickets: {e}")
-            return []
+        key = (bool(status), bool(priority), id_slots)
+        query = _TICKET_QUERY_CACHE.get(key)
+        if query is None:
+            query = _TICKET_QUERY_CACHE.setdefault(key, _build_ticket_query(*key))
 
-    def get_server_stats(self) -> Dict[str, Any]:
-        """Get server statistics"""
+        return query, params
+
+    def iter_customers(self, status: Optional[str] = None,
+                       limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream customers one at a time (generator variant of list_customers)
+
+        The pooled connection is held until the generator is exhausted or
+        closed, so consume it promptly or close it when stopping early.
+        """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = _customer_row
+                cursor.execute(_SQL_LIST_CUSTOMERS, {
+                    "status": status or None,
+                    "limit": -1 if limit is None else limit
+                })
+                for row in cursor:
+                    yield row._asdict()
+
+        except sqlite3.Error as e:
+            logger.error("Error streaming customers: %s", e)
+
+    def iter_tickets_by_criteria(self, status: Optional[str] = None,
+                                 priority: Optional[str] = None,
+                                 customer_ids: Optional[List[int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream tickets one at a time (generator variant of get_tickets_by_criteria)
 
-            # Customer stats
-            cursor.execute("SELECT COUNT(*) as total FROM customers WHERE status='active'")
-            active_customers = cursor.fetchone()['total']
+        The pooled connection is held until the generator is exhausted or
+        closed, so consume it promptly or close it when stopping early.
+        """
+        try:
+            query, params = self._ticket_query(status, priority, customer_ids)
 
-            cursor.execute("SELECT COUNT(*) as total FROM customers WHERE status='disabled'")
-            disabled_customers = cursor.fetchone()['total']
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield dict(row)
 
-            # Ticket stats
-            cursor.execute("SELECT COUNT(*) as total FROM tickets WHERE status='open'")
-            open_tickets = cursor.fetchone()['total']
+        except sqlite3.Error as e:
+            logger.error("Error streaming tickets: %s", e)
 
-            cursor.execute("SELECT COUNT(*) as total FROM tickets WHERE status='in_progress'")
-            in_progress_tickets = cursor.fetchone()['total']
+    def get_server_stats(self) -> Dict[str, Any]:
+        """Get server statistics"""
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute("SELECT COUNT(*) as total FROM tickets WHERE priority='high'")
-            high_priority_tickets = cursor.fetchone()['total']
+                # Customer stats
+                cursor.execute(_SQL_CUSTOMER_STATS)
+                active_customers, disabled_customers = cursor.fetchone()
 
-            conn.close()
+                # Ticket stats
+                cursor.execute(_SQL_TICKET_STATS)
+                open_tickets, in_progress_tickets, high_priority_tickets = cursor.fetchone()
 
             return {
                 "active_customers": active_customers,
@@ -385,12 +757,15 @@ class MCPServer:
             }
 
         except Exception as e:
-            print(f"Error getting stats: {e}")
+            logger.error("Error getting stats: %s", e)
             return {}
 
 
 # Test the MCP Server
 if __name__ == "__main__":
+    # Show the tool call logs on the console
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     print("="*60)
     print("MCP SERVER TEST")
     print("="*60)
@@ -444,3 +819,5 @@ if __name__ == "__main__":
     print("="*60)
     stats = mcp.get_server_stats()
     print(json.dumps(stats, indent=2))
+
+    mcp.close()